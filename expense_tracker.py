@@ -7,248 +7,585 @@ Personal Expense Tracker (CLI)
 - Basic validation & error handling
 """
 
-import argparse
-import sqlite3
-from datetime import datetime
-from pathlib import Path
-from textwrap import dedent
+# Heavier modules (argparse, sqlite3, datetime, decimal, pathlib, csv,
+# textwrap) are imported where they are used, so each command only pays
+# for what it touches.
+import atexit
+import re
+import sys
+from itertools import chain, islice
 
-DB_PATH = Path(__file__).parent / "expenses.db"
+IMPORT_CHUNK_SIZE = 10_000
+OUTPUT_CHUNK_ROWS = 4096
+_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+# Fixed column widths let `list` print rows as they are fetched
+LIST_COLUMNS = (("ID", 8), ("Amount", 12), ("Date", 10), ("Category", 20), ("Note", 40))
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS expenses (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    amount REAL NOT NULL CHECK(amount >= 0),
+    id INTEGER PRIMARY KEY,         -- rowid alias; no AUTOINCREMENT bookkeeping
+    amount_cents INTEGER NOT NULL CHECK(amount_cents >= 0),  -- exact, in cents
     date TEXT NOT NULL,             -- ISO format YYYY-MM-DD
     category TEXT DEFAULT '',
-    note TEXT DEFAULT ''
+    note TEXT DEFAULT '',
+    month TEXT GENERATED ALWAYS AS (substr(date, 1, 7)) VIRTUAL  -- YYYY-MM
 );
-CREATE INDEX IF NOT EXISTS idx_date ON expenses(date);
-CREATE INDEX IF NOT EXISTS idx_category ON expenses(category);
+-- (date, category, amount_cents) covers date-range filters and summaries
+-- without row lookups; (category, date) serves category-scoped date ranges.
+CREATE INDEX IF NOT EXISTS idx_date_cat_amt ON expenses(date, category, amount_cents);
+CREATE INDEX IF NOT EXISTS idx_cat_date ON expenses(category, date);
+CREATE INDEX IF NOT EXISTS idx_month ON expenses(month, amount_cents);
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS idx_date;
+DROP INDEX IF EXISTS idx_category;
+
+-- Copy of expenses clustered on (date, id), kept in sync by the triggers
+-- below, so list queries read rows in sort order from a single B-tree.
+CREATE TABLE IF NOT EXISTS expenses_by_date (
+    date TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    category TEXT DEFAULT '',
+    note TEXT DEFAULT '',
+    PRIMARY KEY (date, id)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS trg_expenses_insert AFTER INSERT ON expenses BEGIN
+    INSERT INTO expenses_by_date(date, id, amount_cents, category, note)
+    VALUES (NEW.date, NEW.id, NEW.amount_cents, NEW.category, NEW.note);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_expenses_update AFTER UPDATE ON expenses BEGIN
+    UPDATE expenses_by_date
+    SET date = NEW.date, amount_cents = NEW.amount_cents, category = NEW.category, note = NEW.note
+    WHERE date = OLD.date AND id = OLD.id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_expenses_delete AFTER DELETE ON expenses BEGIN
+    DELETE FROM expenses_by_date WHERE date = OLD.date AND id = OLD.id;
+END;
+
+-- Per-month running totals (n = number of expenses) kept in sync by the
+-- triggers below, so whole-month summaries never scan expenses.
+CREATE TABLE IF NOT EXISTS summary_month (
+    month TEXT PRIMARY KEY,
+    total_cents INTEGER NOT NULL DEFAULT 0,
+    n INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS trg_summary_month_insert AFTER INSERT ON expenses BEGIN
+    INSERT INTO summary_month(month, total_cents, n) VALUES (NEW.month, NEW.amount_cents, 1)
+    ON CONFLICT(month) DO UPDATE SET total_cents = total_cents + excluded.total_cents, n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_summary_month_update AFTER UPDATE OF amount_cents, date ON expenses BEGIN
+    UPDATE summary_month SET total_cents = total_cents - OLD.amount_cents, n = n - 1
+    WHERE month = OLD.month;
+    DELETE FROM summary_month WHERE month = OLD.month AND n = 0;
+    INSERT INTO summary_month(month, total_cents, n) VALUES (NEW.month, NEW.amount_cents, 1)
+    ON CONFLICT(month) DO UPDATE SET total_cents = total_cents + excluded.total_cents, n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_summary_month_delete AFTER DELETE ON expenses BEGIN
+    UPDATE summary_month SET total_cents = total_cents - OLD.amount_cents, n = n - 1
+    WHERE month = OLD.month;
+    DELETE FROM summary_month WHERE month = OLD.month AND n = 0;
+END;
 """
 
+# Bump SCHEMA_VERSION with a matching MIGRATIONS entry whenever SCHEMA
+# changes; databases created by older versions are upgraded step by step.
+SCHEMA_VERSION = 4
+MIGRATIONS = {
+    1: "ALTER TABLE expenses ADD COLUMN month TEXT GENERATED ALWAYS AS (substr(date, 1, 7)) VIRTUAL;",
+    # Rebuild without AUTOINCREMENT and backfill expenses_by_date
+    2: """
+        CREATE TABLE expenses_new (
+            id INTEGER PRIMARY KEY,
+            amount REAL NOT NULL CHECK(amount >= 0),
+            date TEXT NOT NULL,
+            category TEXT DEFAULT '',
+            note TEXT DEFAULT '',
+            month TEXT GENERATED ALWAYS AS (substr(date, 1, 7)) VIRTUAL
+        );
+        INSERT INTO expenses_new(id, amount, date, category, note)
+            SELECT id, amount, date, category, note FROM expenses;
+        DROP TABLE expenses;
+        ALTER TABLE expenses_new RENAME TO expenses;
+        CREATE TABLE expenses_by_date (
+            date TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            amount REAL NOT NULL,
+            category TEXT DEFAULT '',
+            note TEXT DEFAULT '',
+            PRIMARY KEY (date, id)
+        ) WITHOUT ROWID;
+        INSERT INTO expenses_by_date(date, id, amount, category, note)
+            SELECT date, id, amount, category, note FROM expenses;
+    """,
+    # REAL amount -> INTEGER amount_cents, in both tables
+    3: """
+        CREATE TABLE expenses_new (
+            id INTEGER PRIMARY KEY,
+            amount_cents INTEGER NOT NULL CHECK(amount_cents >= 0),
+            date TEXT NOT NULL,
+            category TEXT DEFAULT '',
+            note TEXT DEFAULT '',
+            month TEXT GENERATED ALWAYS AS (substr(date, 1, 7)) VIRTUAL
+        );
+        INSERT INTO expenses_new(id, amount_cents, date, category, note)
+            SELECT id, CAST(ROUND(amount * 100) AS INTEGER), date, category, note FROM expenses;
+        DROP TABLE expenses;
+        ALTER TABLE expenses_new RENAME TO expenses;
+        DROP TABLE expenses_by_date;
+        CREATE TABLE expenses_by_date (
+            date TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            category TEXT DEFAULT '',
+            note TEXT DEFAULT '',
+            PRIMARY KEY (date, id)
+        ) WITHOUT ROWID;
+        INSERT INTO expenses_by_date(date, id, amount_cents, category, note)
+            SELECT date, id, amount_cents, category, note FROM expenses;
+    """,
+    # Backfill the monthly summary table
+    4: """
+        CREATE TABLE summary_month (
+            month TEXT PRIMARY KEY,
+            total_cents INTEGER NOT NULL DEFAULT 0,
+            n INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID;
+        INSERT INTO summary_month(month, total_cents, n)
+            SELECT month, SUM(amount_cents), COUNT(*) FROM expenses GROUP BY month;
+    """,
+}
+
+# Applied once when the connection is opened. WAL + synchronous=NORMAL
+# avoids an fsync of the rollback journal on every write commit.
+PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA mmap_size = 268435456;",
+    "PRAGMA cache_size = -20000;",
+    "PRAGMA temp_store = MEMORY;",
+)
+
+# Statement text is kept in module-level constants so the connection's
+# statement cache (keyed on the SQL text) hits on every reuse.
+_SQL_INSERT = "INSERT INTO expenses(amount_cents, date, category, note) VALUES(?,?,?,?)"
+_SQL_DELETE = "DELETE FROM expenses WHERE id = ?"
+# One UPDATE per non-empty combination of fields, keyed by a bitmask
+# (amount_cents = 0b1000, date = 0b0100, category = 0b0010, note = 0b0001)
+_UPDATE_FIELDS = ("amount_cents", "date", "category", "note")
+_SQL_UPDATE = {
+    mask: "UPDATE expenses SET "
+    + ", ".join(f"{f} = ?" for i, f in enumerate(_UPDATE_FIELDS) if mask & (0b1000 >> i))
+    + " WHERE id = ?"
+    for mask in range(1, 16)
+}
+# List/summary queries get one statement per combination of filters, keyed
+# by a bitmask (start = 0b100, end = 0b010, category = 0b001; see
+# bind_filters()). Each text only carries the predicates that are bound, so
+# the planner can still seek the date/category indexes.
+_FILTERS = ("date >= ?", "date < ?", "category = ?")
+
+def where_clause(mask, predicates=_FILTERS):
+    conds = [p for i, p in enumerate(predicates) if mask & (1 << (len(predicates) - 1 - i))]
+    return f"WHERE {' AND '.join(conds)}" if conds else ""
+
+_SQL_LIST = {mask: f"""
+    SELECT id, amount_cents, date, category, note
+    FROM expenses_by_date
+    {where_clause(mask)}
+    ORDER BY date DESC, id DESC
+    LIMIT ?;
+""" for mask in range(8)}
+_SQL_SUM_CAT = {mask: f"""
+    SELECT COALESCE(NULLIF(category, ''), 'uncategorized') AS grp,
+           SUM(amount_cents) AS total
+    FROM expenses
+    {where_clause(mask)}
+    GROUP BY grp
+    ORDER BY total DESC;
+""" for mask in range(8)}
+_SQL_SUM_MONTH = {mask: f"""
+    SELECT month AS grp, SUM(amount_cents) AS total
+    FROM expenses
+    {where_clause(mask)}
+    GROUP BY month
+    ORDER BY month DESC;
+""" for mask in range(8)}
+# No entry for mask 0: delete_where() refuses to run without a filter
+_SQL_DELETE_WHERE = {
+    mask: f"DELETE FROM expenses {where_clause(mask)};" for mask in range(1, 8)
+}
+# Whole-month ranges without a category filter are answered from summary_month
+# (keyed by start = 0b10, end = 0b01)
+_SQL_SUM_MONTH_CACHED = {mask: f"""
+    SELECT month AS grp, total_cents AS total
+    FROM summary_month
+    {where_clause(mask, ("month >= ?", "month < ?"))}
+    ORDER BY month DESC;
+""" for mask in range(4)}
+_SQL_SUM_TOTAL = {
+    mask: f"SELECT SUM(amount_cents) FROM expenses {where_clause(mask)};" for mask in range(8)
+}
+
+def db_path():
+    from pathlib import Path
+    return Path(__file__).parent / "expenses.db"
+
 def valid_date(s: str) -> str:
+    from datetime import datetime
+    # Accept YYYY-MM-DD only; regex + datetime() is much cheaper than strptime()
+    m = _DATE_RE.fullmatch(s)
     try:
-        # Accept YYYY-MM-DD only
-        datetime.strptime(s, "%Y-%m-%d")
+        if not m:
+            raise ValueError
+        datetime(*map(int, m.groups()))
         return s
     except ValueError:
+        import argparse
         raise argparse.ArgumentTypeError("Date must be in YYYY-MM-DD format.")
 
-def positive_amount(s: str) -> float:
+def positive_amount(s: str) -> int:
+    from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+    # Amounts are stored as whole cents; Decimal keeps "1.005" from rounding down
     try:
-        val = float(s)
+        val = Decimal(s)
         if val < 0:
             raise ValueError
-        return val
-    except ValueError:
+        return int(val.scaleb(2).to_integral_value(ROUND_HALF_UP))
+    except (ValueError, OverflowError, InvalidOperation):
+        import argparse
         raise argparse.ArgumentTypeError("Amount must be a non-negative number.")
 
+_CONN = None
+
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    # One connection per process; SQLite's page cache is lost on close
+    global _CONN
+    if _CONN is None:
+        import sqlite3
+        # Autocommit: single statements commit on their own; multi-statement
+        # work opens BEGIN IMMEDIATE ... COMMIT explicitly.
+        conn = sqlite3.connect(db_path(), isolation_level=None, cached_statements=256)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        atexit.register(conn.close)
+        _CONN = conn
+    return _CONN
+
+_INITIALIZED = False
 
 def init_db():
-    with get_conn() as conn:
-        conn.executescript(SCHEMA)
-
-def add_expense(amount, date, category, note):
-    init_db()
-    with get_conn() as conn:
-        conn.execute(
-            "INSERT INTO expenses(amount, date, category, note) VALUES(?,?,?,?)",
-            (amount, date, category or "", note or ""),
+    # Schema DDL only needs to run once per process
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+    conn = get_conn()
+    version = conn.execute("PRAGMA user_version;").fetchone()[0]
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'expenses'"
+    ).fetchone()
+    if exists:
+        for v in range(version + 1, SCHEMA_VERSION + 1):
+            conn.executescript(f"BEGIN; {MIGRATIONS[v]} PRAGMA user_version = {v}; COMMIT;")
+    conn.executescript(SCHEMA)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+    _INITIALIZED = True
+
+def add_many(rows):
+    """
+    rows: iterable of (amount_cents, date, category, note) tuples.
+    All rows are inserted with one executemany() inside a single transaction.
+    """
+    conn = get_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(_SQL_INSERT, (
+            (cents, date, category or "", note or "") for cents, date, category, note in rows
+        ))
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def add_expense(amount_cents, date, category, note):
+    # A single INSERT autocommits; no explicit transaction needed
+    get_conn().execute(_SQL_INSERT, (amount_cents, date, category or "", note or ""))
+
+def parse_csv_row(line_no, row):
+    import argparse
+    if len(row) < 2:
+        raise ValueError(f"Line {line_no}: expected amount,date[,category[,note]].")
+    amount, date, category, note = (row + ["", ""])[:4]
+    try:
+        return (positive_amount(amount.strip()), valid_date(date.strip()), category.strip(), note)
+    except argparse.ArgumentTypeError as e:
+        raise ValueError(f"Line {line_no}: {e}")
+
+def import_csv(path):
+    """
+    CSV columns: amount, date[, category[, note]]; an 'amount,...' header row is skipped.
+    Rows are streamed and committed in chunks of IMPORT_CHUNK_SIZE, so an invalid row
+    aborts its own chunk but leaves earlier chunks imported; the error then reports
+    how many rows were already committed.
+    """
+    import csv
+    count = 0
+    # utf-8-sig strips the BOM that spreadsheet exports put before the header
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = (
+            parse_csv_row(line_no, row)
+            for line_no, row in enumerate(csv.reader(f), 1)
+            if row and not (line_no == 1 and row[0].strip().lower() == "amount")
         )
-        conn.commit()
+        try:
+            while True:
+                chunk = list(islice(rows, IMPORT_CHUNK_SIZE))
+                if not chunk:
+                    break
+                add_many(chunk)
+                count += len(chunk)
+        except Exception as e:
+            if count:
+                raise ValueError(f"Imported {count} expenses before error. {e}") from e
+            raise
+    return count
+
+def day_after(s: str) -> str:
+    from datetime import datetime, timedelta
+    return (datetime.fromisoformat(s) + timedelta(days=1)).strftime("%Y-%m-%d")
+
+def filter_args(start=None, end=None, category=None):
+    # Empty values mean "no filter", matching the CLI's optional flags.
+    # The inclusive end date is bound as a half-open "date < end + 1 day";
+    # 9999-12-31 has no next day but already bounds every valid date.
+    start, category = start or None, category or None
+    end_ex = day_after(end) if end and end != "9999-12-31" else None
+    return (start, end_ex, category)
+
+def bind_filters(filters):
+    # (bitmask of the filters that are set, their values in order)
+    mask = 0
+    for v in filters:
+        mask = mask << 1 | (v is not None)
+    return mask, tuple(v for v in filters if v is not None)
+
+def stream_list(start=None, end=None, category=None, limit=None):
+    """Yield rows straight from the cursor instead of materializing them."""
+    mask, args = bind_filters(filter_args(start, end, category))
+    yield from get_conn().execute(_SQL_LIST[mask], args + (limit or -1,))
 
 def list_expenses(start=None, end=None, category=None, limit=None):
-    init_db()
-    q = "SELECT id, amount, date, category, note FROM expenses WHERE 1=1"
-    args = []
-    if start:
-        q += " AND date >= ?"
-        args.append(start)
-    if end:
-        q += " AND date <= ?"
-        args.append(end)
-    if category:
-        q += " AND category = ?"
-        args.append(category)
-    q += " ORDER BY date DESC, id DESC"
-    if limit:
-        q += " LIMIT ?"
-        args.append(limit)
-    with get_conn() as conn:
-        cur = conn.execute(q, args)
-        rows = cur.fetchall()
-    return rows
-
-def update_expense(expense_id, amount=None, date=None, category=None, note=None):
-    init_db()
-    sets = []
-    args = []
-    if amount is not None:
-        sets.append("amount = ?")
-        args.append(amount)
-    if date is not None:
-        sets.append("date = ?")
-        args.append(date)
-    if category is not None:
-        sets.append("category = ?")
-        args.append(category)
-    if note is not None:
-        sets.append("note = ?")
-        args.append(note)
-    if not sets:
+    return list(stream_list(start, end, category, limit))
+
+def update_expense(expense_id, amount_cents=None, date=None, category=None, note=None):
+    mask = ((amount_cents is not None) << 3 | (date is not None) << 2
+            | (category is not None) << 1 | (note is not None))
+    if not mask:
         raise ValueError("No fields provided to update.")
-    args.append(expense_id)
-    q = f"UPDATE expenses SET {', '.join(sets)} WHERE id = ?"
-    with get_conn() as conn:
-        cur = conn.execute(q, args)
-        if cur.rowcount == 0:
-            raise ValueError(f"Expense id {expense_id} not found.")
-        conn.commit()
+    args = tuple(v for v in (amount_cents, date, category, note) if v is not None) + (expense_id,)
+    cur = get_conn().execute(_SQL_UPDATE[mask], args)
+    if cur.rowcount == 0:
+        raise ValueError(f"Expense id {expense_id} not found.")
 
 def delete_expense(expense_id):
-    init_db()
-    with get_conn() as conn:
-        cur = conn.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
-        if cur.rowcount == 0:
-            raise ValueError(f"Expense id {expense_id} not found.")
-        conn.commit()
+    cur = get_conn().execute(_SQL_DELETE, (expense_id,))
+    if cur.rowcount == 0:
+        raise ValueError(f"Expense id {expense_id} not found.")
+
+def delete_where(start=None, end=None, category=None):
+    """
+    Delete every expense matching the filters with one set-based DELETE
+    in a single write transaction; returns the number of rows removed.
+    """
+    mask, args = bind_filters(filter_args(start, end, category))
+    if not mask:
+        raise ValueError("Refusing to delete everything; give --start, --end or --category.")
+    conn = get_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cur = conn.execute(_SQL_DELETE_WHERE[mask], args)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return cur.rowcount
 
 def summarize(start=None, end=None, by=None, category=None):
     """
     by: None | 'category' | 'month'
     Optional filter: category (when grouping by month or none, we can still filter to a given category)
     """
-    init_db()
-    filters = []
-    args = []
-    if start:
-        filters.append("date >= ?")
-        args.append(start)
-    if end:
-        filters.append("date <= ?")
-        args.append(end)
-    if category:
-        filters.append("category = ?")
-        args.append(category)
-    where = f"WHERE {' AND '.join(filters)}" if filters else ""
-
-    with get_conn() as conn:
-        if by == "category":
-            q = f"""
-                SELECT COALESCE(NULLIF(category, ''), 'uncategorized') AS grp, 
-                       ROUND(SUM(amount), 2) AS total
-                FROM expenses
-                {where}
-                GROUP BY grp
-                ORDER BY total DESC;
-            """
-            cur = conn.execute(q, args)
-            return cur.fetchall()
-        elif by == "month":
-            # Expect date in YYYY-MM-DD; use substr to get YYYY-MM
-            q = f"""
-                SELECT substr(date, 1, 7) AS grp, ROUND(SUM(amount), 2) AS total
-                FROM expenses
-                {where}
-                GROUP BY grp
-                ORDER BY grp DESC;
-            """
-            cur = conn.execute(q, args)
-            return cur.fetchall()
+    filters = filter_args(start, end, category)
+    mask, args = bind_filters(filters)
+    conn = get_conn()
+    if by == "category":
+        cur = conn.execute(_SQL_SUM_CAT[mask], args)
+        return cur.fetchall()
+    elif by == "month":
+        first, end_ex, cat = filters
+        if cat is None and all(d is None or d.endswith("-01") for d in (first, end_ex)):
+            month_mask, months = bind_filters((first and first[:7], end_ex and end_ex[:7]))
+            cur = conn.execute(_SQL_SUM_MONTH_CACHED[month_mask], months)
         else:
-            q = f"SELECT ROUND(SUM(amount), 2) FROM expenses {where};"
-            cur = conn.execute(q, args)
-            total = cur.fetchone()[0]
-            return [("total", total or 0.0)]
+            cur = conn.execute(_SQL_SUM_MONTH[mask], args)
+        return cur.fetchall()
+    else:
+        cur = conn.execute(_SQL_SUM_TOTAL[mask], args)
+        total = cur.fetchone()[0]
+        return [("total", total or 0)]
+
+def format_cents(cents):
+    return f"{cents / 100:.2f}"
+
+def write_lines(lines):
+    """Write lines to stdout in chunks of OUTPUT_CHUNK_ROWS instead of one print() each."""
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, OUTPUT_CHUNK_ROWS))
+        if not chunk:
+            break
+        sys.stdout.write("\n".join(chunk) + "\n")
+    sys.stdout.flush()
 
 def print_table(rows, headers):
     if not rows:
         print("No records found.")
         return
-    widths = [len(h) for h in headers]
     str_rows = [[str(c) if c is not None else "" for c in row] for row in rows]
-    for r in str_rows:
-        widths = [max(w, len(c)) for w, c in zip(widths, r)]
+    # One transpose, then a single C-level max() per column
+    widths = [max(len(h), *map(len, col)) for h, col in zip(headers, zip(*str_rows))]
     fmt = " | ".join("{:<" + str(w) + "}" for w in widths)
-    print(fmt.format(*headers))
-    print("-+-".join("-" * w for w in widths))
-    for r in str_rows:
-        print(fmt.format(*r))
+    write_lines(chain(
+        (fmt.format(*headers), "-+-".join("-" * w for w in widths)),
+        (fmt.format(*r) for r in str_rows),
+    ))
 
-def main():
+def fit(value, width):
+    s = str(value) if value is not None else ""
+    return s if len(s) <= width else s[:width - 1] + "…"
+
+def print_stream(rows, columns):
+    """Print rows as they arrive using fixed (header, width) columns; long cells are truncated."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        print("No records found.")
+        return
+    widths = [w for _, w in columns]
+    fmt = " | ".join("{:<" + str(w) + "}" for w in widths)
+    write_lines(chain(
+        (fmt.format(*(h for h, _ in columns)), "-+-".join("-" * w for w in widths)),
+        (fmt.format(*(fit(c, w) for c, w in zip(row, widths))) for row in chain((first,), rows)),
+    ))
+
+EPILOG = """
+    Examples:
+      Add:    python expense_tracker.py add --amount 120.50 --date 2025-10-03 --category food --note "Lunch"
+      List:   python expense_tracker.py list --start 2025-10-01 --end 2025-10-31 --category food
+      Update: python expense_tracker.py update 3 --amount 200 --note "Corrected"
+      Delete: python expense_tracker.py delete 3
+      Purge:  python expense_tracker.py purge --end 2024-12-31
+      Import: python expense_tracker.py import-csv expenses.csv
+      Sum:    python expense_tracker.py summary
+      By cat: python expense_tracker.py summary --by category
+      By mon: python expense_tracker.py summary --by month
+"""
+
+def configure_add(p):
+    p.add_argument("--amount", type=positive_amount, required=True)
+    p.add_argument("--date", type=valid_date, required=True)
+    p.add_argument("--category", type=str, default="")
+    p.add_argument("--note", type=str, default="")
+
+def configure_list(p):
+    p.add_argument("--start", type=valid_date)
+    p.add_argument("--end", type=valid_date)
+    p.add_argument("--category", type=str)
+    p.add_argument("--limit", type=int)
+
+def configure_update(p):
+    p.add_argument("id", type=int)
+    p.add_argument("--amount", type=positive_amount)
+    p.add_argument("--date", type=valid_date)
+    p.add_argument("--category", type=str)
+    p.add_argument("--note", type=str)
+
+def configure_delete(p):
+    p.add_argument("id", type=int)
+
+def configure_purge(p):
+    p.add_argument("--start", type=valid_date)
+    p.add_argument("--end", type=valid_date)
+    p.add_argument("--category", type=str)
+
+def configure_import(p):
+    p.add_argument("path")
+
+def configure_summary(p):
+    p.add_argument("--start", type=valid_date)
+    p.add_argument("--end", type=valid_date)
+    p.add_argument("--by", choices=["category", "month"])
+    p.add_argument("--category", type=str)
+
+# name -> (help, function adding the subcommand's arguments)
+COMMANDS = {
+    "add": ("Add a new expense", configure_add),
+    "list": ("View expenses", configure_list),
+    "update": ("Update an expense by ID", configure_update),
+    "delete": ("Delete an expense by ID", configure_delete),
+    "purge": ("Delete all expenses matching filters", configure_purge),
+    "import-csv": ("Bulk-import expenses from a CSV file", configure_import),
+    "summary": ("Show summary totals", configure_summary),
+}
+
+def build_parser(argv):
+    """
+    Only the invoked subcommand's parser is built; help requests and
+    unknown commands get the full parser (and the examples epilog).
+    """
+    import argparse
+    from textwrap import dedent
+    cmd = argv[0] if argv else None
+    full = cmd not in COMMANDS
     parser = argparse.ArgumentParser(
         prog="expense-tracker",
         description="Personal Expense Tracker (CLI) — SQLite-backed",
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=dedent("""
-            Examples:
-              Add:    python expense_tracker.py add --amount 120.50 --date 2025-10-03 --category food --note "Lunch"
-              List:   python expense_tracker.py list --start 2025-10-01 --end 2025-10-31 --category food
-              Update: python expense_tracker.py update 3 --amount 200 --note "Corrected"
-              Delete: python expense_tracker.py delete 3
-              Sum:    python expense_tracker.py summary
-              By cat: python expense_tracker.py summary --by category
-              By mon: python expense_tracker.py summary --by month
-        """),
+        epilog=dedent(EPILOG) if full else None,
     )
-
     sub = parser.add_subparsers(dest="cmd", required=True)
+    for name in (COMMANDS if full else (cmd,)):
+        help_text, configure = COMMANDS[name]
+        configure(sub.add_parser(name, help=help_text))
+    return parser
 
-    # add
-    p_add = sub.add_parser("add", help="Add a new expense")
-    p_add.add_argument("--amount", type=positive_amount, required=True)
-    p_add.add_argument("--date", type=valid_date, required=True)
-    p_add.add_argument("--category", type=str, default="")
-    p_add.add_argument("--note", type=str, default="")
-
-    # list
-    p_list = sub.add_parser("list", help="View expenses")
-    p_list.add_argument("--start", type=valid_date)
-    p_list.add_argument("--end", type=valid_date)
-    p_list.add_argument("--category", type=str)
-    p_list.add_argument("--limit", type=int)
-
-    # update
-    p_update = sub.add_parser("update", help="Update an expense by ID")
-    p_update.add_argument("id", type=int)
-    p_update.add_argument("--amount", type=positive_amount)
-    p_update.add_argument("--date", type=valid_date)
-    p_update.add_argument("--category", type=str)
-    p_update.add_argument("--note", type=str)
-
-    # delete
-    p_delete = sub.add_parser("delete", help="Delete an expense by ID")
-    p_delete.add_argument("id", type=int)
-
-    # summary
-    p_sum = sub.add_parser("summary", help="Show summary totals")
-    p_sum.add_argument("--start", type=valid_date)
-    p_sum.add_argument("--end", type=valid_date)
-    p_sum.add_argument("--by", choices=["category", "month"])
-    p_sum.add_argument("--category", type=str)
-
-    args = parser.parse_args()
+def main():
+    args = build_parser(sys.argv[1:]).parse_args()
 
     try:
+        init_db()
         if args.cmd == "add":
             add_expense(args.amount, args.date, args.category, args.note)
             print("✅ Added.")
         elif args.cmd == "list":
-            rows = list_expenses(args.start, args.end, args.category, args.limit)
-            print_table(rows, headers=["ID", "Amount", "Date", "Category", "Note"])
+            rows = stream_list(args.start, args.end, args.category, args.limit)
+            rows = ((i, format_cents(cents), d, c, n) for i, cents, d, c, n in rows)
+            print_stream(rows, LIST_COLUMNS)
         elif args.cmd == "update":
             update_expense(args.id, args.amount, args.date, args.category, args.note)
             print("✅ Updated.")
         elif args.cmd == "delete":
             delete_expense(args.id)
             print("🗑️ Deleted.")
+        elif args.cmd == "purge":
+            count = delete_where(args.start, args.end, args.category)
+            print(f"🗑️ Deleted {count} expenses.")
+        elif args.cmd == "import-csv":
+            count = import_csv(args.path)
+            print(f"✅ Imported {count} expenses.")
         elif args.cmd == "summary":
             rows = summarize(args.start, args.end, args.by, args.category)
+            rows = [(grp, format_cents(total)) for grp, total in rows]
             hdr = {"category": ["Category", "Total"],
                    "month": ["Month", "Total"]}.get(args.by, ["Metric", "Value"])
             print_table(rows, headers=hdr)